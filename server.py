@@ -1,20 +1,68 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
 from flask_cors import CORS
+import atexit
+import hashlib
 import os
-import json
+import orjson
+import re
+import shutil
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from cachetools import LRUCache, TTLCache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from dotenv import load_dotenv
-from jira import JIRA
+from jira import JIRA, JIRAError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, writes stay atomic
+    fcntl = None
 
 # Load environment variables from .env file (override shell vars)
 load_dotenv(override=True)
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
+Compress(app)
 
 # Path to store workstreams data
 WORKSTREAMS_FILE = 'workstreams.json'
-CACHE_FILE = 'cache.json'
+CACHE_DIR = 'cache'
+BACKUP_DIR = 'backups'
+JOBS_DIR = 'jobs'
+BACKUP_INDEX_FILE = os.path.join(BACKUP_DIR, '.backup_index')
+BACKUP_COUNT = 5
+WRITE_LOCK_FILE = '.write.lock'
+PREFETCH_LOCK_FILE = os.path.join(CACHE_DIR, '.prefetch.lock')
 CACHE_EXPIRY_HOURS = 1
+CACHE_FLUSH_SECONDS = 10
+CACHE_SWEEP_SECONDS = 15 * 60
+CACHE_MAX_ENTRIES = 5000
+# Most tickets one export/summary request may ask for
+MAX_TICKET_KEYS = CACHE_MAX_ENTRIES
+FIELDS_CACHE_FILE = 'fields_cache.json'
+FIELDS_CACHE_EXPIRY_HOURS = 24
+SEARCH_MAX_RESULTS = 1000
+# Standard fields requested for every parsed issue
+ISSUE_FIELDS = ['summary', 'status', 'assignee', 'reporter', 'priority', 'issuetype', 'parent', 'issuelinks', 'subtasks', 'resolution', 'updated']
 
 # Load JIRA config from environment variables
 jira_config = {
@@ -22,20 +70,62 @@ jira_config = {
     'email': os.getenv('JIRA_EMAIL', ''),
     'token': os.getenv('JIRA_TOKEN', ''),
     'estimation_field': os.getenv('JIRA_ESTIMATION_FIELD', ''),
-    'sprint_field': os.getenv('JIRA_SPRINT_FIELD', '')
+    'sprint_field': os.getenv('JIRA_SPRINT_FIELD', ''),
+    'parallelism': int(os.getenv('JIRA_PARALLELISM', '5')),
+    'batch_size': int(os.getenv('JIRA_BATCH_SIZE', '100')),
+    'rate_per_sec': float(os.getenv('JIRA_RATE_PER_SEC', '10')),
+    'prefetch_minutes': float(os.getenv('JIRA_PREFETCH_MINUTES', '0'))
 }
 
 # Load LLM config from environment variables (optional - for summaries)
 llm_config = {
     'api_key': os.getenv('LLM_API_KEY', ''),
     'api_base': os.getenv('LLM_API_BASE', None),  # None = OpenAI default
-    'model': os.getenv('LLM_MODEL', 'gpt-4o-mini')
+    'model': os.getenv('LLM_MODEL', 'gpt-4o-mini'),
+    'max_input_tokens': int(os.getenv('LLM_MAX_INPUT_TOKENS', '12000')),
+    'concurrency': int(os.getenv('LLM_CONCURRENCY', '4'))
 }
 
 # Cache for custom field mappings (name -> field ID)
 custom_field_cache = {}
+_fields_loaded = False
+_negative = set()
+custom_fields_lock = threading.Lock()
+
+# Common custom field names (lowercased, in order of preference)
+ESTIMATION_FIELD_NAMES = (
+    'story point estimate',  # Atlassian default
+    'story points',
+    'points',
+    'estimate',
+    'effort',
+    't-shirt size',
+    'size'
+)
+SPRINT_FIELD_NAMES = ('sprint', 'sprints', 'active sprint', 'active sprints')
+
+# Issue-owned parsed fields keyed by (issue key, updated timestamp)
+parse_cache = LRUCache(maxsize=5000)
+parse_cache_lock = threading.Lock()
+
+# Shared worker pool for concurrent JIRA requests
+jira_executor = ThreadPoolExecutor(max_workers=jira_config['parallelism'])
+
+# Worker pool for partial summaries of oversized changelogs
+llm_executor = ThreadPoolExecutor(max_workers=llm_config['concurrency'])
+
+# Background summary jobs; separate from llm_executor, whose partial summaries they wait on
+summary_executor = ThreadPoolExecutor(max_workers=llm_config['concurrency'])
+
+# Single worker so workstreams backups are written and rotated in order
+backup_executor = ThreadPoolExecutor(max_workers=1)
 
 # Validate configuration on startup
+if jira_config['prefetch_minutes'] >= CACHE_EXPIRY_HOURS * 60:
+    # Entries would expire between prefetches, and every run would refetch everything
+    print(f"WARNING: JIRA_PREFETCH_MINUTES must be under {CACHE_EXPIRY_HOURS * 60}; using {CACHE_EXPIRY_HOURS * 30}")
+    jira_config['prefetch_minutes'] = CACHE_EXPIRY_HOURS * 30
+
 if not jira_config['host'] or not jira_config['token']:
     print('\n' + '='*60)
     print('WARNING: JIRA configuration incomplete!')
@@ -43,6 +133,45 @@ if not jira_config['host'] or not jira_config['token']:
     print('See .env.example for reference')
     print('='*60 + '\n')
 
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that limits this process's requests to rate_per_sec, allowing a one-second burst"""
+
+    def __init__(self, rate_per_sec, **kwargs):
+        self.interval = 1.0 / rate_per_sec if rate_per_sec > 0 else 0
+        self.next_slot = 0.0
+        self.slot_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def wait_for_slot(self):
+        """Block until the next request slot under the rate limit"""
+        if self.interval:
+            with self.slot_lock:
+                now = time.monotonic()
+                slot = max(self.next_slot, now - 1.0)
+                self.next_slot = slot + self.interval
+            if slot > now:
+                time.sleep(slot - now)
+
+    def send(self, request, **kwargs):
+        self.wait_for_slot()
+        return super().send(request, **kwargs)
+
+class RateLimitedRetry(Retry):
+    """Retry that takes a rate limit slot before every resent request"""
+
+    wait_for_slot = None
+
+    def new(self, **kw):
+        # urllib3 copies the Retry for each attempt; carry the limiter over
+        retry = super().new(**kw)
+        retry.wait_for_slot = self.wait_for_slot
+        return retry
+
+    def sleep(self, response=None):
+        super().sleep(response)
+        if self.wait_for_slot:
+            self.wait_for_slot()
+
 def initialize_jira_client():
     """Initialize JIRA client with appropriate authentication"""
     if not jira_config['host'] or not jira_config['token']:
@@ -51,7 +180,7 @@ def initialize_jira_client():
     try:
         if jira_config['email']:
             # Cloud: Basic Auth
-            return JIRA(
+            client = JIRA(
                 server=jira_config['host'],
                 basic_auth=(jira_config['email'], jira_config['token'])
             )
@@ -59,10 +188,22 @@ def initialize_jira_client():
             # Server/Data Center: Bearer token
             headers = JIRA.DEFAULT_OPTIONS["headers"].copy()
             headers["Authorization"] = f"Bearer {jira_config['token']}"
-            return JIRA(
+            client = JIRA(
                 server=jira_config['host'],
                 options={"headers": headers}
             )
+
+        # Size the connection pool so concurrent requests reuse connections, keep
+        # under the JIRA rate limit, and retry rate-limited or transient server
+        # errors with backoff (honouring Retry-After). POST is retried too since
+        # the only POSTs sent are read-only bulk searches
+        retry = RateLimitedRetry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                                 allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {'POST'}, raise_on_status=False)
+        adapter = RateLimitedAdapter(jira_config['rate_per_sec'], pool_connections=32, pool_maxsize=64, max_retries=retry)
+        retry.wait_for_slot = adapter.wait_for_slot
+        client._session.mount('https://', adapter)
+        client._session.mount('http://', adapter)
+        return client
     except Exception as e:
         print(f"Failed to initialize JIRA client: {e}")
         return None
@@ -71,7 +212,7 @@ jira_client = initialize_jira_client()
 
 @app.route('/')
 def index():
-    return send_from_directory('.', 'index.html')
+    return send_from_directory('.', 'index.html', max_age=60)
 
 @app.route('/favicon.svg')
 def favicon():
@@ -106,14 +247,43 @@ def config_status():
         'auth_mode': auth_mode
     })
 
+@app.route('/api/config/refresh-fields', methods=['POST'])
+def refresh_fields():
+    """Forget resolved custom field IDs so they are looked up again"""
+    global _fields_loaded
+    with custom_fields_lock:
+        custom_field_cache.clear()
+        _negative.clear()
+        _fields_loaded = False
+        if os.path.exists(FIELDS_CACHE_FILE):
+            os.remove(FIELDS_CACHE_FILE)
+    get_estimation_field_id.cache_clear()
+    get_sprint_field_id.cache_clear()
+    get_issue_field_ids.cache_clear()
+    with parse_cache_lock:
+        parse_cache.clear()
+    return jsonify({'success': True})
+
+def not_modified(etag):
+    """Empty 304 response carrying the current ETag"""
+    response = Response(status=304)
+    response.set_etag(etag, weak=True)
+    return response
+
 @app.route('/api/workstreams', methods=['GET'])
 def get_workstreams():
     """Load workstreams from file"""
     try:
         if os.path.exists(WORKSTREAMS_FILE):
-            with open(WORKSTREAMS_FILE, 'r') as f:
-                workstreams = json.load(f)
-            return jsonify({'workstreams': workstreams})
+            etag = str(os.stat(WORKSTREAMS_FILE).st_mtime_ns)
+            if request.if_none_match.contains_weak(etag):
+                return not_modified(etag)
+            # The file is JSON we wrote ourselves, so embed it without re-encoding
+            with open(WORKSTREAMS_FILE, 'rb') as f:
+                workstreams = f.read().strip() or b'[]'
+            response = Response(b'{"workstreams":' + workstreams + b'}', mimetype='application/json')
+            response.set_etag(etag, weak=True)
+            return response
         else:
             return jsonify({'workstreams': []})
     except Exception as e:
@@ -125,53 +295,241 @@ def save_workstreams():
     try:
         data_to_save = request.json
 
-        # Create backup if file exists and has content
-        if os.path.exists(WORKSTREAMS_FILE):
-            with open(WORKSTREAMS_FILE, 'r') as f:
-                existing = f.read()
-                if existing and existing != '[]' and existing != '{}':
-                    import time
-                    backup_file = f'workstreams_backup_{int(time.time())}.json'
-                    with open(backup_file, 'w') as bf:
-                        bf.write(existing)
-
-                    # Keep only last 5 backups
-                    backups = sorted([f for f in os.listdir('.') if f.startswith('workstreams_backup_')])
-                    for old_backup in backups[:-5]:
-                        os.remove(old_backup)
+        # Create backup if file exists and has content ('[]'/'{}' count as empty);
+        # a failed backup is logged but never blocks the save
+        try:
+            if os.stat(WORKSTREAMS_FILE).st_size > 4:
+                # Write the backup off the request path, one at a time
+                backup_executor.submit(write_workstreams_backup, stage_workstreams_backup())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error backing up workstreams: {e}")
 
         # Save new data
-        with open(WORKSTREAMS_FILE, 'w') as f:
-            json.dump(data_to_save, f, indent=2)
+        write_json_atomic(WORKSTREAMS_FILE, data_to_save)
 
         return jsonify({'success': True})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-def load_cache():
-    """Load cache from cache.json"""
+def stage_workstreams_backup():
+    """Link the current workstreams file into the backup directory before it is replaced"""
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    staged = os.path.join(BACKUP_DIR, f'.pending_{time.time_ns()}.json')
+    try:
+        # Saves replace the file rather than rewrite it, so the link keeps the old contents
+        os.link(WORKSTREAMS_FILE, staged)
+    except OSError:
+        try:
+            shutil.copyfile(WORKSTREAMS_FILE, staged)
+        except Exception:
+            # Don't leave a partial copy behind (e.g. on a full disk)
+            if os.path.exists(staged):
+                os.remove(staged)
+            raise
+    return staged
+
+def write_workstreams_backup(staged):
+    """Move a staged backup into the next slot of a 5-file ring"""
+    try:
+        index = read_backup_index()
+        os.replace(staged, os.path.join(BACKUP_DIR, f'workstreams_{index}.json'))
+        write_file_atomic(BACKUP_INDEX_FILE, str((index + 1) % BACKUP_COUNT).encode())
+    except Exception as e:
+        print(f"Error writing workstreams backup: {e}")
+
+def read_backup_index():
+    """Read the next backup slot from the backup index file"""
+    try:
+        with open(BACKUP_INDEX_FILE) as f:
+            return int(f.read().strip()) % BACKUP_COUNT
+    except (FileNotFoundError, ValueError):
+        return 0
+
+def write_json_atomic(path, data):
+    """Write data as JSON to a temp file, then atomically replace path"""
+    write_file_atomic(path, orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+def write_file_atomic(path, content):
+    """Write bytes to a temp file, then atomically replace path"""
+    # Hold an exclusive lock on the directory's lock file while writing, so
+    # threads and worker processes never interleave writes to the same temp file
+    lock_path = os.path.join(os.path.dirname(path) or '.', WRITE_LOCK_FILE)
+    with open(lock_path, 'a') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+# Summary job files are named after a uuid4 hex job ID
+JOB_ID_RE = re.compile(r'[0-9a-f]{32}')
+
+# Cache files are named after the ticket key, so only accept JIRA-style keys
+CACHE_KEY_RE = re.compile(r'[A-Za-z][A-Za-z0-9_]*-[0-9]+')
+
+def clean_ticket_keys(ticket_keys):
+    """Normalize requested ticket keys, dropping malformed ones and duplicates (keeps order)"""
+    keys = (key.strip().upper() for key in ticket_keys if isinstance(key, str))
+    return list(dict.fromkeys(key for key in keys if CACHE_KEY_RE.fullmatch(key)))
+
+def load_cache_entry(ticket_key):
+    """Load one ticket's cache entry from cache/<ticket_key>.json if present"""
+    if not CACHE_KEY_RE.fullmatch(ticket_key):
+        return None
     try:
-        if os.path.exists(CACHE_FILE):
-            with open(CACHE_FILE, 'r') as f:
-                return json.load(f)
+        with open(os.path.join(CACHE_DIR, f'{ticket_key}.json'), 'rb') as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
     except Exception as e:
-        print(f"Error loading cache: {e}")
-    return {}
+        print(f"Error loading cache for {ticket_key}: {e}")
+        return None
 
-def save_cache(cache):
-    """Save cache to cache.json"""
+def save_cache_entry(ticket_key, entry):
+    """Save one ticket's cache entry to cache/<ticket_key>.json"""
+    if not CACHE_KEY_RE.fullmatch(ticket_key):
+        return
     try:
-        with open(CACHE_FILE, 'w') as f:
-            json.dump(cache, f, indent=2)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        write_json_atomic(os.path.join(CACHE_DIR, f'{ticket_key}.json'), entry)
     except Exception as e:
-        print(f"Error saving cache: {e}")
+        print(f"Error saving cache for {ticket_key}: {e}")
+
+# In-memory ticket details cache, filled from the cache directory on first
+# use of each ticket; changed entries are written back in the background.
+# Bounded LRU, so tickets no longer queried drop out of memory
+ticket_cache = LRUCache(maxsize=CACHE_MAX_ENTRIES)
+ticket_cache_lock = threading.RLock()
+ticket_cache_dirty = set()
+
+def flush_cache():
+    """Persist cache entries that changed since the last flush"""
+    with ticket_cache_lock:
+        dirty = {key: ticket_cache[key] for key in ticket_cache_dirty if key in ticket_cache}
+        ticket_cache_dirty.clear()
+    for key, entry in dirty.items():
+        save_cache_entry(key, entry)
+
+def get_cache_entry(ticket_key):
+    """Get a ticket's cache entry from memory, falling back to its cache file"""
+    with ticket_cache_lock:
+        cached = ticket_cache.get(ticket_key)
+    if cached is None or not is_cache_fresh(cached):
+        # Other worker processes (such as the one prefetching) may have
+        # refreshed the file since this process loaded the entry
+        loaded = load_cache_entry(ticket_key)
+        if loaded is not None and 'cached_at' in loaded:
+            with ticket_cache_lock:
+                cached = ticket_cache.get(ticket_key)
+                if cached is None or cached.get('cached_at', '') < loaded['cached_at']:
+                    ticket_cache[ticket_key] = cached = loaded
+    return cached
+
+def cache_flush_loop():
+    """Periodically flush the in-memory cache to disk"""
+    while True:
+        time.sleep(CACHE_FLUSH_SECONDS)
+        flush_cache()
+
+def sweep_cache():
+    """Drop expired ticket cache entries from memory and disk, and old summary jobs"""
+    with ticket_cache_lock:
+        expired = [key for key, entry in ticket_cache.items() if not is_cache_fresh(entry)]
+        for key in expired:
+            del ticket_cache[key]
+            ticket_cache_dirty.discard(key)
+
+    # Cache files are rewritten whenever their ticket is refetched, so the
+    # modification time is when the entry was cached; summary job results
+    # are kept for as long
+    cutoff = time.time() - CACHE_EXPIRY_HOURS * 3600
+    for directory in (CACHE_DIR, JOBS_DIR):
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.json') and entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error sweeping {directory}: {e}")
+
+def cache_sweep_loop():
+    """Periodically evict expired cache entries"""
+    while True:
+        time.sleep(CACHE_SWEEP_SECONDS)
+        sweep_cache()
+
+def workstream_ticket_keys():
+    """Collect the keys of all tickets shown in saved workstreams"""
+    try:
+        with open(WORKSTREAMS_FILE, 'rb') as f:
+            data = orjson.loads(f.read())
+    except FileNotFoundError:
+        return []
+
+    # Older files are a bare list of workstreams (the frontend migrates them to pages)
+    pages = (data.get('pages') or []) if isinstance(data, dict) else [{'workstreams': data}]
+    keys = []
+    for page in pages:
+        for workstream in page.get('workstreams') or []:
+            for ticket in workstream.get('tickets') or []:
+                keys.append(ticket.get('key') if isinstance(ticket, dict) else ticket)
+    return clean_ticket_keys(keys)
+
+def prefetch_ticket_details():
+    """Refetch workstream tickets whose cache entries would expire before the next prefetch"""
+    if not jira_client:
+        return
+    # Entries younger than this stay fresh until the next run
+    hours = CACHE_EXPIRY_HOURS - jira_config['prefetch_minutes'] / 60
+    stale = [key for key in workstream_ticket_keys() if not is_cache_fresh(get_cache_entry(key), hours)]
+    if not stale:
+        return
+    print(f"Prefetching {len(stale)} tickets from JIRA")
+    for future in as_completed(submit_searches_by_keys(stale, ticket_details_fields(), expand='changelog')):
+        try:
+            issues = future.result()
+        except Exception as e:
+            print(f"Error prefetching issues: {e}")
+            continue
+        for key, issue in issues.items():
+            cache_ticket_details(key, build_ticket_details(key, issue))
+
+def cache_prefetch_loop():
+    """Periodically warm the ticket cache for saved workstreams"""
+    # Only one worker process prefetches; the lock is held for the process lifetime
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    lock_file = open(PREFETCH_LOCK_FILE, 'a')
+    if fcntl:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return
+    while True:
+        time.sleep(jira_config['prefetch_minutes'] * 60)
+        try:
+            prefetch_ticket_details()
+        except Exception as e:
+            print(f"Error prefetching tickets: {e}")
+
+threading.Thread(target=cache_flush_loop, daemon=True).start()
+threading.Thread(target=cache_sweep_loop, daemon=True).start()
+if jira_config['prefetch_minutes'] > 0:
+    threading.Thread(target=cache_prefetch_loop, daemon=True).start()
+atexit.register(flush_cache)
 
 def is_cache_fresh(cached_data, hours=CACHE_EXPIRY_HOURS):
     """Check if cached data is fresh (less than specified hours old)"""
     if not cached_data or 'cached_at' not in cached_data:
         return False
 
-    from datetime import datetime, timezone, timedelta
     cached_at = datetime.fromisoformat(cached_data['cached_at'])
     now = datetime.now(timezone.utc)
     age = now - cached_at
@@ -180,78 +538,119 @@ def is_cache_fresh(cached_data, hours=CACHE_EXPIRY_HOURS):
 
 def filter_ticket_data_by_date(full_data, days):
     """Filter changelog and comments by date range"""
-    from datetime import datetime, timedelta, timezone
-    cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
-
-    filtered_data = full_data.copy()
-    filtered_data['changes'] = []
-    filtered_data['comments'] = []
-
-    # Filter changes
-    for change in full_data.get('changes', []):
-        change_date = datetime.fromisoformat(change['date_iso'])
-        if change_date >= cutoff_date:
-            filtered_data['changes'].append({
-                'date': change['date'],
-                'date_iso': change['date_iso'],
-                'author': change['author'],
-                'field': change['field'],
-                'from': change['from'],
-                'to': change['to']
-            })
+    cutoff_ts = (datetime.now(timezone.utc) - timedelta(days=days)).timestamp()
 
-    # Filter comments
-    for comment in full_data.get('comments', []):
-        comment_date = datetime.fromisoformat(comment['date_iso'])
-        if comment_date >= cutoff_date:
-            filtered_data['comments'].append({
-                'date': comment['date'],
-                'date_iso': comment['date_iso'],
-                'author': comment['author'],
-                'body': comment['body']
-            })
+    filtered_data = {k: v for k, v in full_data.items() if k not in ('changes', 'comments', 'changes_ts', 'comments_ts')}
+    for list_key in ('changes', 'comments'):
+        filtered_data[list_key] = full_data[list_key][bisect_left(full_data[f'{list_key}_ts'], cutoff_ts):]
 
     return filtered_data
 
+def parse_sprint_string(sprint_str):
+    """Extract (name, state) from a sprint string without regex scanning"""
+    # Format: "com.atlassian.greenhopper.service.sprint.Sprint@14b1c359[id=123,rapidViewId=456,state=ACTIVE,name=Sprint 1,...]"
+    def value_after(prefix):
+        start = sprint_str.find(prefix)
+        if start == -1:
+            return None
+        start += len(prefix)
+        end = len(sprint_str)
+        for separator in (',', ']'):
+            index = sprint_str.find(separator, start)
+            if index != -1 and index < end:
+                end = index
+        return sprint_str[start:end] or None
+
+    return value_after('name='), value_after('state=')
+
 def get_cached_ticket_details(ticket_key, days):
     """Get ticket details from cache or fetch from JIRA if stale/missing"""
-    cache = load_cache()
     cache_key = ticket_key  # No days suffix - cache full data
 
+    cached = get_cache_entry(cache_key)
+
     # Check if we have fresh cached data
-    if cache_key in cache and is_cache_fresh(cache[cache_key]):
+    if is_cache_fresh(cached):
         print(f"Cache hit for {ticket_key}")
         # Filter cached data by requested time range
-        filtered_data = filter_ticket_data_by_date(cache[cache_key]['data'], days)
+        filtered_data = filter_ticket_data_by_date(cached['data'], days)
         filtered_data['_cache_hit'] = True
         return filtered_data
 
     # Fetch from JIRA
     print(f"Cache miss for {ticket_key}, fetching from JIRA")
-    from datetime import datetime, timedelta, timezone
 
     if not jira_client:
         raise Exception('JIRA client not configured')
 
-    # Use library to fetch issue with changelog
+    # Use library to fetch issue with changelog, limited to the fields we keep
     issue = jira_client.issue(
         ticket_key,
-        expand='changelog,renderedFields'
+        fields=ticket_details_fields(),
+        expand='changelog'
     )
-    fields = issue.fields
+    ticket_details = cache_ticket_details(ticket_key, build_ticket_details(ticket_key, issue.raw))
 
-    # Extract ticket details (handle None values)
-    status = getattr(fields, 'status', None)
-    assignee = getattr(fields, 'assignee', None)
-    priority = getattr(fields, 'priority', None)
+    # Return filtered data for the requested time range
+    filtered_data = filter_ticket_data_by_date(ticket_details, days)
+    filtered_data['_cache_hit'] = False
+    return filtered_data
+
+def ticket_details_fields():
+    """JIRA fields needed to build ticket details from a search result"""
+    search_fields = ['summary', 'status', 'assignee', 'priority', 'description', 'comment']
+    for field_id in (get_estimation_field_id(), get_sprint_field_id()):
+        if field_id:
+            search_fields.append(field_id)
+    return ','.join(search_fields)
+
+def bulk_get_ticket_details(ticket_keys):
+    """Map ticket keys to full ticket details, fetching only stale/missing tickets from JIRA"""
+    return {key: ticket_details for key, ticket_details, _ in iter_ticket_details(ticket_keys)}
+
+def iter_ticket_details(ticket_keys):
+    """Yield (key, full details, cache hit) for tickets as they become available, cached ones first"""
+    missing = []
+    for key in dict.fromkeys(ticket_keys):
+        cached = get_cache_entry(key)
+        if is_cache_fresh(cached):
+            yield key, cached['data'], True
+        else:
+            missing.append(key)
 
+    if missing and jira_client:
+        print(f"Cache miss for {len(missing)} tickets, fetching from JIRA")
+        for future in as_completed(submit_searches_by_keys(missing, ticket_details_fields(), expand='changelog')):
+            try:
+                issues = future.result()
+            except Exception as e:
+                print(f"Error fetching issues: {e}")
+                continue
+            for key, issue in issues.items():
+                yield key, cache_ticket_details(key, build_ticket_details(key, issue)), False
+
+def cache_ticket_details(ticket_key, ticket_details):
+    """Store full ticket details (all changes and comments) in the cache"""
+    with ticket_cache_lock:
+        ticket_cache[ticket_key] = {
+            'cached_at': datetime.now(timezone.utc).isoformat(),
+            'data': ticket_details
+        }
+        ticket_cache_dirty.add(ticket_key)
+    return ticket_details
+
+def build_ticket_details(ticket_key, raw):
+    """Build full ticket details from a raw JIRA issue (with changelog)"""
+    fields = raw.get('fields') or {}
+
+    # Extract ticket details (handle None values)
     ticket_details = {
         'key': ticket_key,
-        'summary': getattr(fields, 'summary', 'No summary'),
-        'status': status.name if status and hasattr(status, 'name') else 'Unknown',
-        'assignee': assignee.displayName if assignee and hasattr(assignee, 'displayName') else 'Unassigned',
-        'priority': priority.name if priority and hasattr(priority, 'name') else 'None',
-        'description': getattr(fields, 'description', ''),
+        'summary': fields.get('summary', 'No summary'),
+        'status': (fields.get('status') or {}).get('name', 'Unknown'),
+        'assignee': (fields.get('assignee') or {}).get('displayName', 'Unassigned'),
+        'priority': (fields.get('priority') or {}).get('name', 'None'),
+        'description': fields.get('description', ''),
         'estimation': None,
         'sprint': None,
         'sprint_state': None,  # active, future, or closed
@@ -262,15 +661,14 @@ def get_cached_ticket_details(ticket_key, days):
     # Try to find estimation field by name
     estimation_field_id = get_estimation_field_id()
     if estimation_field_id:
-        estimation_value = getattr(fields, estimation_field_id, None)
+        estimation_value = fields.get(estimation_field_id)
         if estimation_value is not None:
             ticket_details['estimation'] = estimation_value
 
     # Try to find sprint field by name
-    import re
     sprint_field_id = get_sprint_field_id()
     if sprint_field_id:
-        sprint_data = getattr(fields, sprint_field_id, None)
+        sprint_data = fields.get(sprint_field_id)
         if sprint_data:
             # Sprint data can be an array of sprint objects or strings
             if isinstance(sprint_data, list) and len(sprint_data) > 0:
@@ -279,89 +677,84 @@ def get_cached_ticket_details(ticket_key, days):
 
                 if isinstance(last_sprint, str):
                     # Parse sprint string format: "com.atlassian.greenhopper.service.sprint.Sprint@14b1c359[id=123,rapidViewId=456,state=ACTIVE,name=Sprint 1,...]"
-                    sprint_name_match = re.search(r'name=([^,\]]+)', last_sprint)
-                    sprint_state_match = re.search(r'state=([^,\]]+)', last_sprint)
+                    sprint_name, sprint_state = parse_sprint_string(last_sprint)
 
-                    if sprint_name_match:
-                        ticket_details['sprint'] = sprint_name_match.group(1)
-                    if sprint_state_match:
-                        ticket_details['sprint_state'] = sprint_state_match.group(1).lower()
+                    if sprint_name:
+                        ticket_details['sprint'] = sprint_name
+                    if sprint_state:
+                        ticket_details['sprint_state'] = sprint_state.lower()
                 elif isinstance(last_sprint, dict):
                     # Sprint is already a dict object
                     ticket_details['sprint'] = last_sprint.get('name', 'Unknown Sprint')
                     ticket_details['sprint_state'] = (last_sprint.get('state') or '').lower()
 
     # Extract ALL changelog (no date filtering)
-    if hasattr(issue, 'changelog') and issue.changelog:
-        histories = issue.changelog.histories if hasattr(issue.changelog, 'histories') else []
-        for history in histories:
-            created_str_raw = history.created if hasattr(history, 'created') else None
-            if not created_str_raw:
-                continue
-            created = datetime.fromisoformat(str(created_str_raw).replace('Z', '+00:00'))
-            author_obj = history.author if hasattr(history, 'author') else None
-            author = author_obj.displayName if author_obj and hasattr(author_obj, 'displayName') else 'Unknown'
-            created_str = created.strftime('%Y-%m-%d %H:%M')
-
-            items = history.items if hasattr(history, 'items') else []
-            for item in items:
-                field = item.field if hasattr(item, 'field') else ''
-                from_val = item.fromString if hasattr(item, 'fromString') else 'None'
-                to_val = item.toString if hasattr(item, 'toString') else 'None'
-                ticket_details['changes'].append({
-                    'date': created_str,
-                    'date_iso': created.isoformat(),  # Store ISO for filtering
-                    'author': author,
-                    'field': field,
-                    'from': from_val if from_val else 'None',
-                    'to': to_val if to_val else 'None'
-                })
-
-    # Extract ALL comments (no date filtering)
-    comment_data = getattr(fields, 'comment', None)
-    if comment_data:
-        comments = comment_data.comments if hasattr(comment_data, 'comments') else []
-        for comment in comments:
-            created_str_raw = comment.created if hasattr(comment, 'created') else None
-            if not created_str_raw:
-                continue
-            created = datetime.fromisoformat(str(created_str_raw).replace('Z', '+00:00'))
-            author_obj = comment.author if hasattr(comment, 'author') else None
-            author = author_obj.displayName if author_obj and hasattr(author_obj, 'displayName') else 'Unknown'
-            created_str = created.strftime('%Y-%m-%d %H:%M')
-            body = comment.body if hasattr(comment, 'body') else ''
-            ticket_details['comments'].append({
+    for history in (raw.get('changelog') or {}).get('histories') or ():
+        created_str_raw = history.get('created')
+        if not created_str_raw:
+            continue
+        created_str_raw = str(created_str_raw)
+        created = datetime.fromisoformat(created_str_raw.replace('Z', '+00:00'))
+        author = (history.get('author') or {}).get('displayName', 'Unknown')
+        # JIRA timestamps start with the local 'YYYY-MM-DDTHH:MM', so slice it out
+        created_str = f"{created_str_raw[:10]} {created_str_raw[11:16]}"
+        created_iso = created.astimezone(timezone.utc).isoformat(timespec='milliseconds')  # Store UTC ISO for filtering
+
+        for item in history.get('items') or ():
+            from_val = item.get('fromString')
+            to_val = item.get('toString')
+            ticket_details['changes'].append({
                 'date': created_str,
-                'date_iso': created.isoformat(),  # Store ISO for filtering
+                'date_iso': created_iso,
                 'author': author,
-                'body': body
+                'field': item.get('field', ''),
+                'from': from_val if from_val else 'None',
+                'to': to_val if to_val else 'None'
             })
 
-    # Cache the FULL result (all changes and comments)
-    cache[cache_key] = {
-        'cached_at': datetime.now(timezone.utc).isoformat(),
-        'data': ticket_details
-    }
-    save_cache(cache)
+    # Extract ALL comments (no date filtering)
+    for comment in (fields.get('comment') or {}).get('comments') or ():
+        created_str_raw = comment.get('created')
+        if not created_str_raw:
+            continue
+        created_str_raw = str(created_str_raw)
+        created = datetime.fromisoformat(created_str_raw.replace('Z', '+00:00'))
+        author = (comment.get('author') or {}).get('displayName', 'Unknown')
+        created_str = f"{created_str_raw[:10]} {created_str_raw[11:16]}"
+        ticket_details['comments'].append({
+            'date': created_str,
+            'date_iso': created.astimezone(timezone.utc).isoformat(timespec='milliseconds'),  # Store UTC ISO for filtering
+            'author': author,
+            'body': comment.get('body', '')
+        })
 
-    # Return filtered data for the requested time range
-    filtered_data = filter_ticket_data_by_date(ticket_details, days)
-    filtered_data['_cache_hit'] = False
-    return filtered_data
+    # Keep changes/comments in date order with a parallel epoch timestamp index,
+    # so filtering by date range is a binary search
+    for list_key in ('changes', 'comments'):
+        ticket_details[list_key].sort(key=lambda item: item['date_iso'])
+        ticket_details[f'{list_key}_ts'] = [datetime.fromisoformat(item['date_iso']).timestamp() for item in ticket_details[list_key]]
 
-def get_custom_field_id(field_name):
-    """Get custom field ID by name, with caching"""
-    global custom_field_cache
+    return ticket_details
 
-    if not jira_client:
-        return None
+def load_custom_fields():
+    """Fetch all custom fields from JIRA once and map lowercased names to IDs"""
+    global _fields_loaded
 
-    # Return from cache if available
-    if field_name in custom_field_cache:
-        return custom_field_cache[field_name]
+    if _fields_loaded or not jira_client:
+        return
+
+    # Only one request fetches the field list; others wait and reuse it
+    with custom_fields_lock:
+        if _fields_loaded:
+            return
+
+        # Reuse the field map saved by a previous run if it is recent enough
+        saved = load_fields_cache()
+        if saved is not None:
+            custom_field_cache.update(saved)
+            _fields_loaded = True
+            return
 
-    # Fetch all fields from JIRA if cache is empty
-    if not custom_field_cache:
         try:
             fields = jira_client.fields()
             # Build cache mapping from field names to field IDs
@@ -371,12 +764,54 @@ def get_custom_field_id(field_name):
                     field_id = field.get('id')
                     if name and field_id:
                         custom_field_cache[name] = field_id
+            _fields_loaded = True
+            write_json_atomic(FIELDS_CACHE_FILE, {
+                'cached_at': datetime.now(timezone.utc).isoformat(),
+                'host': jira_config['host'],
+                'fields': custom_field_cache
+            })
         except Exception as e:
             print(f"Warning: Could not fetch custom fields: {e}")
 
+def load_fields_cache():
+    """Load the custom field map from fields_cache.json if fresh and for this host"""
+    try:
+        if os.path.exists(FIELDS_CACHE_FILE):
+            with open(FIELDS_CACHE_FILE, 'rb') as f:
+                saved = orjson.loads(f.read())
+            if saved.get('host') == jira_config['host'] and is_cache_fresh(saved, hours=FIELDS_CACHE_EXPIRY_HOURS):
+                return saved.get('fields', {})
+    except Exception as e:
+        print(f"Error loading fields cache: {e}")
+    return None
+
+def get_custom_field_id(field_name):
+    """Get custom field ID by name, with caching"""
+    if not jira_client:
+        return None
+
+    name_lower = field_name.lower()
+
+    # Return from cache if available
+    if name_lower in custom_field_cache:
+        return custom_field_cache[name_lower]
+    if _fields_loaded and name_lower in _negative:
+        return None
+
+    load_custom_fields()
+
     # Return field ID if found, otherwise None
-    return custom_field_cache.get(field_name.lower())
+    field_id = custom_field_cache.get(name_lower)
+    if field_id is None and _fields_loaded:
+        _negative.add(name_lower)
+    return field_id
+
+def find_custom_field_id(field_names):
+    """Return the ID of the first of field_names (lowercased) that exists in JIRA"""
+    load_custom_fields()
+    return next((custom_field_cache[n] for n in field_names if n in custom_field_cache), None)
 
+@lru_cache(maxsize=None)
 def get_estimation_field_id():
     """Get estimation field ID, trying env var override first, then common names"""
     # Option 2: Try environment variable override first
@@ -386,24 +821,9 @@ def get_estimation_field_id():
             return field_id
 
     # Option 1: Try common estimation field names
-    common_names = [
-        'Story point estimate',  # Atlassian default
-        'Story Points',
-        'Points',
-        'Estimate',
-        'Story points',
-        'Effort',
-        'T-Shirt Size',
-        'Size'
-    ]
-
-    for field_name in common_names:
-        field_id = get_custom_field_id(field_name)
-        if field_id:
-            return field_id
-
-    return None
+    return find_custom_field_id(ESTIMATION_FIELD_NAMES)
 
+@lru_cache(maxsize=None)
 def get_sprint_field_id():
     """Get sprint field ID, trying env var override first, then common names"""
     # Try environment variable override first
@@ -413,19 +833,121 @@ def get_sprint_field_id():
             return field_id
 
     # Try common sprint field names
-    common_names = [
-        'Sprint',
-        'Sprints',
-        'Active Sprint',
-        'Active Sprints'
+    return find_custom_field_id(SPRINT_FIELD_NAMES)
+
+@lru_cache(maxsize=None)
+def get_issue_field_ids():
+    """Resolve the estimation, Epic Link, Parent Link and sprint field IDs once"""
+    return (
+        get_estimation_field_id(),
+        get_custom_field_id('Epic Link'),
+        get_custom_field_id('Parent Link'),
+        get_sprint_field_id()
+    )
+
+def search_issues_by_keys(keys, fields, expand=None):
+    """Fetch raw issues by key with one POSTed JQL search (100 keys max), keyed by requested key"""
+    # The POST /search body takes expand as a list; Cloud's search/jql (Cloud
+    # auth is chosen by JIRA_EMAIL) takes the comma-separated string
+    search_expand = expand.split(',') if expand and not jira_config['email'] else expand
+    try:
+        result = jira_client.search_issues(
+            jql_str=f"key in ({','.join(keys)})",
+            maxResults=len(keys),
+            validate_query=False,
+            fields=fields,
+            expand=search_expand,
+            json_result=True,
+            use_post=True
+        )
+    except JIRAError as e:
+        # One deleted or restricted key fails the whole search with a 400 (Cloud
+        # ignores validateQuery), so split the batch to keep the other keys;
+        # anything else means JIRA itself is failing and goes to the caller
+        if e.status_code != 400:
+            raise
+        if len(keys) > 1:
+            mid = len(keys) // 2
+            return {**search_issues_by_keys(keys[:mid], fields, expand), **search_issues_by_keys(keys[mid:], fields, expand)}
+        print(f"Error searching for {keys[0]}: {e}")
+        result = {}
+
+    requested = set(keys)
+    issues = {}
+    for issue in result.get('issues', []):
+        if issue['key'] in requested:
+            issues[issue['key']] = issue
+
+    # Moved or renamed tickets come back under their new key; fetching the
+    # requested key directly follows the redirect
+    for key in keys:
+        if key not in issues:
+            try:
+                issues[key] = jira_client.issue(key, fields=fields, expand=expand).raw
+            except Exception as e:
+                print(f"Error fetching {key}: {e}")
+                if getattr(e, 'status_code', None) not in (403, 404):
+                    # Not a problem with this key, so don't try every remaining one
+                    break
+    return issues
+
+def submit_searches_by_keys(keys, fields, expand=None):
+    """Submit one search per 100 keys to the shared pool and return the futures"""
+    keys = sorted(keys)
+    return [
+        jira_executor.submit(search_issues_by_keys, keys[i:i + 100], fields, expand)
+        for i in range(0, len(keys), 100)
     ]
 
-    for field_name in common_names:
-        field_id = get_custom_field_id(field_name)
-        if field_id:
-            return field_id
+def search_all_issues(jql, fields, expand=None):
+    """Fetch raw issues for a JQL query page by page, up to SEARCH_MAX_RESULTS, and whether more matched"""
+    batch_size = jira_config['batch_size']
 
-    return None
+    # json_result skips building Issue objects
+    def fetch_page(start_at):
+        return jira_client.search_issues(
+            jql_str=jql,
+            startAt=start_at,
+            maxResults=batch_size,
+            fields=fields,
+            expand=expand,
+            json_result=True
+        )
+
+    first = fetch_page(0)
+    issues = first.get('issues', [])
+
+    if 'total' not in first:
+        # Cloud search has no total or startAt, only a token for the next page
+        result = first
+        while result.get('nextPageToken') and not result.get('isLast') and len(issues) < SEARCH_MAX_RESULTS:
+            result = jira_client.enhanced_search_issues(
+                jql_str=jql,
+                nextPageToken=result['nextPageToken'],
+                maxResults=batch_size,
+                fields=fields,
+                expand=expand,
+                json_result=True
+            )
+            issues.extend(result.get('issues', []))
+        truncated = len(issues) > SEARCH_MAX_RESULTS or bool(result.get('nextPageToken') and not result.get('isLast'))
+        return issues[:SEARCH_MAX_RESULTS], truncated
+
+    # Server/Data Center reports the total, so fetch remaining pages concurrently,
+    # stepping by the page size JIRA actually returned (it may cap maxResults)
+    total = first['total']
+    wanted = min(total, SEARCH_MAX_RESULTS)
+    page_size = len(issues)
+    if page_size:
+        futures = [jira_executor.submit(fetch_page, start_at) for start_at in range(page_size, wanted, page_size)]
+        for future in futures:
+            issues.extend(future.result().get('issues', []))
+
+    # Issues can shift between pages while they are fetched, so drop repeats
+    issues = list({issue['key']: issue for issue in issues}.values())[:SEARCH_MAX_RESULTS]
+    if len(issues) < wanted:
+        print(f"Search returned {len(issues)} of {wanted} issues: {jql}")
+    return issues, len(issues) < total
 
 @app.route('/api/search', methods=['POST'])
 def search_issues():
@@ -440,31 +962,11 @@ def search_issues():
 
     try:
         # Build fields list with dynamic custom field IDs
-        fields = ['summary', 'status', 'assignee', 'reporter', 'priority', 'issuetype', 'parent', 'issuelinks', 'subtasks', 'resolution']
-
-        # Add custom fields if found
-        estimation_field = get_estimation_field_id()
-        if estimation_field:
-            fields.append(estimation_field)
-
-        epic_link_field = get_custom_field_id('Epic Link')
-        if epic_link_field:
-            fields.append(epic_link_field)
+        field_ids = get_issue_field_ids()
+        fields = ISSUE_FIELDS + [field_id for field_id in field_ids if field_id]
 
-        parent_link_field = get_custom_field_id('Parent Link')
-        if parent_link_field:
-            fields.append(parent_link_field)
-
-        sprint_field = get_sprint_field_id()
-        if sprint_field:
-            fields.append(sprint_field)
-
-        # Use library search
-        issues = jira_client.search_issues(
-            jql_str=jql,
-            maxResults=100,
-            fields=','.join(fields)
-        )
+        # The changelog lets parse_issue find each ticket's latest status change
+        issues, truncated = search_all_issues(jql, ','.join(fields), expand='changelog')
 
         # Process results
         tickets = []
@@ -472,73 +974,34 @@ def search_issues():
         parent_keys = set()
 
         for issue in issues:
-            ticket = parse_issue(issue)
+            ticket = parse_issue(issue, *field_ids)
             tickets.append(ticket)
-            if ticket.get('epicKey'):
+            # Only look up names the search result did not already include
+            if ticket.get('epicKey') and ticket['epicName'] == ticket['epicKey']:
                 epic_keys.add(ticket['epicKey'])
-            if ticket.get('parentKey'):
+            if ticket.get('parentKey') and ticket['parentName'] == ticket['parentKey']:
                 parent_keys.add(ticket['parentKey'])
 
-        # Fetch epic summaries using library
-        epic_summaries = {}
-        for epic_key in epic_keys:
+        # Every 100-key chunk runs concurrently
+        summary_futures = submit_searches_by_keys(epic_keys | parent_keys, fields='summary')
+
+        # Collect epic and parent summaries
+        summaries = {}
+        for future in summary_futures:
             try:
-                epic = jira_client.issue(epic_key, fields='summary')
-                epic_summaries[epic_key] = epic.fields.summary if hasattr(epic.fields, 'summary') else epic_key
-            except:
-                epic_summaries[epic_key] = epic_key
-
-        # Fetch parent summaries using library
-        parent_summaries = {}
-        for parent_key in parent_keys:
-            # Skip if already fetched as epic
-            if parent_key not in epic_summaries:
-                try:
-                    parent = jira_client.issue(parent_key, fields='summary')
-                    parent_summaries[parent_key] = parent.fields.summary if hasattr(parent.fields, 'summary') else parent_key
-                except:
-                    parent_summaries[parent_key] = parent_key
-            else:
-                parent_summaries[parent_key] = epic_summaries[parent_key]
-
-        # Update tickets with epic and parent summaries
+                for key, issue in future.result().items():
+                    summaries[key] = (issue.get('fields') or {}).get('summary') or key
+            except Exception as e:
+                print(f"Error fetching epic/parent summaries: {e}")
+
+        # Update tickets with epic/parent summaries
         for ticket in tickets:
-            if ticket.get('epicKey') and ticket['epicKey'] in epic_summaries:
-                ticket['epicName'] = epic_summaries[ticket['epicKey']]
-            if ticket.get('parentKey') and ticket['parentKey'] in parent_summaries:
-                ticket['parentName'] = parent_summaries[ticket['parentKey']]
-
-        # Fetch status change dates for in-progress and review tickets
-        in_progress_tickets = [
-            t for t in tickets
-            if t.get('statusCategory') in ['indeterminate'] or
-               (t.get('status', '').lower().find('review') != -1)
-        ]
-
-        for ticket in in_progress_tickets:
-            try:
-                # Fetch with changelog expanded using library
-                issue_with_changelog = jira_client.issue(
-                    ticket['key'],
-                    expand='changelog',
-                    fields='status'
-                )
-                if hasattr(issue_with_changelog, 'changelog') and issue_with_changelog.changelog:
-                    histories = issue_with_changelog.changelog.histories if hasattr(issue_with_changelog.changelog, 'histories') else []
-                    # Look for most recent status change
-                    for history in reversed(histories):
-                        items = history.items if hasattr(history, 'items') else []
-                        for item in items:
-                            if hasattr(item, 'field') and item.field == 'status':
-                                ticket['statusChangeDate'] = history.created if hasattr(history, 'created') else None
-                                break
-                        if ticket.get('statusChangeDate'):
-                            break
-            except:
-                # If fetching changelog fails, just skip it
-                pass
-
-        return jsonify({'tickets': tickets})
+            if ticket.get('epicKey'):
+                ticket['epicName'] = summaries.get(ticket['epicKey'], ticket['epicName'])
+            if ticket.get('parentKey'):
+                ticket['parentName'] = summaries.get(ticket['parentKey'], ticket['parentName'])
+
+        return jsonify({'tickets': tickets, 'truncated': truncated})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -549,24 +1012,8 @@ def get_issue(issue_key):
 
     try:
         # Build fields list with dynamic custom field IDs
-        fields = ['summary', 'status', 'assignee', 'reporter', 'priority', 'issuetype', 'parent', 'issuelinks', 'subtasks', 'resolution']
-
-        # Add custom fields if found
-        estimation_field = get_estimation_field_id()
-        if estimation_field:
-            fields.append(estimation_field)
-
-        epic_link_field = get_custom_field_id('Epic Link')
-        if epic_link_field:
-            fields.append(epic_link_field)
-
-        parent_link_field = get_custom_field_id('Parent Link')
-        if parent_link_field:
-            fields.append(parent_link_field)
-
-        sprint_field = get_sprint_field_id()
-        if sprint_field:
-            fields.append(sprint_field)
+        field_ids = get_issue_field_ids()
+        fields = ISSUE_FIELDS + [field_id for field_id in field_ids if field_id]
 
         # Use library to fetch issue
         issue = jira_client.issue(
@@ -575,48 +1022,85 @@ def get_issue(issue_key):
             expand='changelog'
         )
 
-        return jsonify(parse_issue(issue))
+        return jsonify(parse_issue(issue, *field_ids))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-def parse_issue(issue):
-    """Parse JIRA library Issue object into dict format"""
-    fields = issue.fields
-    status = fields.status if hasattr(fields, 'status') else None
-    assignee = fields.assignee if hasattr(fields, 'assignee') else None
-    reporter = fields.reporter if hasattr(fields, 'reporter') else None
-    priority = fields.priority if hasattr(fields, 'priority') else None
-    issuetype = fields.issuetype if hasattr(fields, 'issuetype') else None
-
-    # Get estimation value from custom field (Option 3: handle different types)
-    story_points = None
-    estimation_field = get_estimation_field_id()
-    if estimation_field:
-        estimation_value = getattr(fields, estimation_field, None)
-        if estimation_value is not None:
-            # Handle numeric values (story points, hours, etc.)
-            if isinstance(estimation_value, (int, float)):
-                # Convert to int if it's a whole number
-                if isinstance(estimation_value, float) and estimation_value.is_integer():
-                    story_points = int(estimation_value)
-                else:
+def parse_issue(issue, estimation_field, epic_link_field, parent_link_field, sprint_field):
+    """Parse a JIRA issue (raw dict or Issue object) using field IDs resolved by the caller"""
+    raw = issue.raw if hasattr(issue, 'raw') else issue
+    fields = raw.get('fields') or {}
+
+    # Fields the issue owns parse the same while it is unchanged; subtask,
+    # parent, link and sprint data belong to other issues (or the sprint) and
+    # can change without bumping updated, so they are rebuilt every time
+    cache_key = (raw.get('key'), fields.get('updated'))
+    own = None
+    if cache_key[1]:
+        with parse_cache_lock:
+            own = parse_cache.get(cache_key)
+    if own is None:
+        status = fields.get('status') or {}
+        assignee = fields.get('assignee') or {}
+        reporter = fields.get('reporter') or {}
+        priority = fields.get('priority') or {}
+        issuetype = fields.get('issuetype') or {}
+
+        # Get estimation value from custom field (Option 3: handle different types)
+        story_points = None
+        if estimation_field:
+            estimation_value = fields.get(estimation_field)
+            if estimation_value is not None:
+                # Handle numeric values (story points, hours, etc.)
+                if isinstance(estimation_value, (int, float)):
+                    # Convert to int if it's a whole number
+                    if isinstance(estimation_value, float) and estimation_value.is_integer():
+                        story_points = int(estimation_value)
+                    else:
+                        story_points = estimation_value
+                # Handle string values (t-shirt sizes, etc.)
+                elif isinstance(estimation_value, str):
                     story_points = estimation_value
-            # Handle string values (t-shirt sizes, etc.)
-            elif isinstance(estimation_value, str):
-                story_points = estimation_value
-            # Handle object values (some fields return {value: "M", id: "123"})
-            elif isinstance(estimation_value, dict):
-                story_points = estimation_value.get('value') or estimation_value.get('name')
-            # For other types, convert to string
-            else:
-                story_points = str(estimation_value)
+                # Handle object values (some fields return {value: "M", id: "123"})
+                elif isinstance(estimation_value, dict):
+                    story_points = estimation_value.get('value') or estimation_value.get('name')
+                # For other types, convert to string
+                else:
+                    story_points = str(estimation_value)
+
+        # Get resolution
+        resolution_name = (fields.get('resolution') or {}).get('name')
+
+        # Get status change date from the most recent status change in the changelog
+        histories = (raw.get('changelog') or {}).get('histories') or ()
+        status_change_date = next((
+            history.get('created')
+            for history in reversed(histories)
+            if any(item.get('field') == 'status' for item in history.get('items') or ())
+        ), None)
+
+        own = {
+            'key': raw.get('key'),
+            'summary': fields.get('summary', ''),
+            'status': status.get('name', 'Unknown'),
+            'statusCategory': (status.get('statusCategory') or {}).get('key', 'other'),
+            'assignee': assignee.get('displayName', 'Unassigned'),
+            'reporter': reporter.get('displayName', 'Unknown'),
+            'priority': priority.get('name', 'None'),
+            'storyPoints': story_points,
+            'type': issuetype.get('name', 'Task'),
+            'resolution': resolution_name,
+            'statusChangeDate': status_change_date
+        }
+        if cache_key[1]:
+            with parse_cache_lock:
+                parse_cache[cache_key] = own
 
     # Get sprint information
     sprint = None
     sprint_state = None
-    sprint_field_id = get_sprint_field_id()
-    if sprint_field_id:
-        sprint_data = getattr(fields, sprint_field_id, None)
+    if sprint_field:
+        sprint_data = fields.get(sprint_field)
         if sprint_data:
             # Sprint data can be an array of sprint objects or strings
             if isinstance(sprint_data, list) and len(sprint_data) > 0:
@@ -625,14 +1109,12 @@ def parse_issue(issue):
 
                 if isinstance(last_sprint, str):
                     # Parse sprint string format
-                    import re
-                    sprint_name_match = re.search(r'name=([^,\]]+)', last_sprint)
-                    sprint_state_match = re.search(r'state=([^,\]]+)', last_sprint)
-
-                    if sprint_name_match:
-                        sprint = sprint_name_match.group(1)
-                    if sprint_state_match:
-                        sprint_state = sprint_state_match.group(1).lower()
+                    sprint_name, sprint_state_value = parse_sprint_string(last_sprint)
+
+                    if sprint_name:
+                        sprint = sprint_name
+                    if sprint_state_value:
+                        sprint_state = sprint_state_value.lower()
                 elif isinstance(last_sprint, dict):
                     # Sprint is already a dict object
                     sprint = last_sprint.get('name', 'Unknown Sprint')
@@ -645,14 +1127,14 @@ def parse_issue(issue):
     epic_name = None
 
     # Try parent field first (standard field, used in JIRA Cloud native hierarchies and subtasks)
-    parent = getattr(fields, 'parent', None)
+    parent = fields.get('parent')
     if parent:
-        parent_key = parent.key if hasattr(parent, 'key') else None
-        parent_name = parent.fields.summary if hasattr(parent, 'fields') and hasattr(parent.fields, 'summary') else parent_key
+        parent_key = parent.get('key')
+        parent_fields = parent.get('fields') or {}
+        parent_name = parent_fields.get('summary', parent_key)
 
         # Check if parent is an Epic (JIRA Cloud native hierarchy)
-        parent_issuetype = parent.fields.issuetype if hasattr(parent, 'fields') and hasattr(parent.fields, 'issuetype') else None
-        parent_type_name = parent_issuetype.name if parent_issuetype and hasattr(parent_issuetype, 'name') else ''
+        parent_type_name = (parent_fields.get('issuetype') or {}).get('name') or ''
 
         if parent_type_name.lower() == 'epic':
             # Parent is an Epic, so populate both epic and parent
@@ -661,87 +1143,57 @@ def parse_issue(issue):
 
     # Try Epic Link custom field (JIRA Server/Data Center, older JIRA Cloud)
     if not epic_key:
-        epic_link_field = get_custom_field_id('Epic Link')
         if epic_link_field:
-            epic_link = getattr(fields, epic_link_field, None)
+            epic_link = fields.get(epic_link_field)
             if epic_link:
                 epic_key = epic_link
                 epic_name = epic_link
 
     # Try Parent Link custom field (some JIRA instances use this for custom hierarchies)
     if not parent_key:
-        parent_link_field = get_custom_field_id('Parent Link')
         if parent_link_field:
-            parent_link = getattr(fields, parent_link_field, None)
+            parent_link = fields.get(parent_link_field)
             if parent_link:
                 parent_key = parent_link
                 parent_name = parent_link  # Will be fetched later
 
     # Get issue links (blocks, depends on, etc.)
     issue_links = []
-    issuelinks = getattr(fields, 'issuelinks', []) or []
-    for link in issuelinks:
-        if hasattr(link, 'outwardIssue'):
-            outward = link.outwardIssue
+    for link in fields.get('issuelinks') or []:
+        link_type = link.get('type') or {}
+        outward = link.get('outwardIssue')
+        if outward:
             issue_links.append({
-                'type': link.type.outward if hasattr(link.type, 'outward') else '',
-                'key': outward.key if hasattr(outward, 'key') else '',
-                'summary': outward.fields.summary if hasattr(outward, 'fields') and hasattr(outward.fields, 'summary') else ''
+                'type': link_type.get('outward', ''),
+                'key': outward.get('key', ''),
+                'summary': (outward.get('fields') or {}).get('summary', '')
             })
-        if hasattr(link, 'inwardIssue'):
-            inward = link.inwardIssue
+        inward = link.get('inwardIssue')
+        if inward:
             issue_links.append({
-                'type': link.type.inward if hasattr(link.type, 'inward') else '',
-                'key': inward.key if hasattr(inward, 'key') else '',
-                'summary': inward.fields.summary if hasattr(inward, 'fields') and hasattr(inward.fields, 'summary') else ''
+                'type': link_type.get('inward', ''),
+                'key': inward.get('key', ''),
+                'summary': (inward.get('fields') or {}).get('summary', '')
             })
 
     # Get subtasks
     subtasks = []
-    subtasks_list = getattr(fields, 'subtasks', []) or []
-    for subtask in subtasks_list:
+    for subtask in fields.get('subtasks') or []:
+        subtask_fields = subtask.get('fields') or {}
         subtasks.append({
-            'key': subtask.key if hasattr(subtask, 'key') else '',
-            'summary': subtask.fields.summary if hasattr(subtask, 'fields') and hasattr(subtask.fields, 'summary') else '',
-            'status': subtask.fields.status.name if hasattr(subtask, 'fields') and hasattr(subtask.fields, 'status') and hasattr(subtask.fields.status, 'name') else 'Unknown'
+            'key': subtask.get('key', ''),
+            'summary': subtask_fields.get('summary', ''),
+            'status': (subtask_fields.get('status') or {}).get('name', 'Unknown')
         })
 
-    # Get resolution
-    resolution = getattr(fields, 'resolution', None)
-    resolution_name = resolution.name if resolution and hasattr(resolution, 'name') else None
-
-    # Get status change date from changelog
-    status_change_date = None
-    if hasattr(issue, 'changelog') and issue.changelog:
-        histories = issue.changelog.histories if hasattr(issue.changelog, 'histories') else []
-        # Look for most recent status change
-        for history in reversed(histories):
-            items = history.items if hasattr(history, 'items') else []
-            for item in items:
-                if hasattr(item, 'field') and item.field == 'status':
-                    status_change_date = history.created if hasattr(history, 'created') else None
-                    break
-            if status_change_date:
-                break
-
     return {
-        'key': issue.key,
-        'summary': fields.summary if hasattr(fields, 'summary') else '',
-        'status': status.name if status and hasattr(status, 'name') else 'Unknown',
-        'statusCategory': status.statusCategory.key if status and hasattr(status, 'statusCategory') and hasattr(status.statusCategory, 'key') else 'other',
-        'assignee': assignee.displayName if assignee and hasattr(assignee, 'displayName') else 'Unassigned',
-        'reporter': reporter.displayName if reporter and hasattr(reporter, 'displayName') else 'Unknown',
-        'priority': priority.name if priority and hasattr(priority, 'name') else 'None',
-        'storyPoints': story_points,
-        'type': issuetype.name if issuetype and hasattr(issuetype, 'name') else 'Task',
+        **own,
         'epicKey': epic_key,
         'epicName': epic_name,
         'parentKey': parent_key,
         'parentName': parent_name,
         'issueLinks': issue_links,
         'subtasks': subtasks,
-        'resolution': resolution_name,
-        'statusChangeDate': status_change_date,
         'sprint': sprint,
         'sprintState': sprint_state
     }
@@ -769,6 +1221,45 @@ def get_ticket_details():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/ticket/details/stream', methods=['POST'])
+def stream_ticket_details():
+    """Stream details for many tickets as server-sent events, cached tickets first"""
+    if not jira_config['host']:
+        return jsonify({'error': 'JIRA not configured'}), 400
+
+    try:
+        data = request.json
+        ticket_keys = clean_ticket_keys(data.get('keys', []))
+        days = data.get('days', 7)
+
+        if not ticket_keys:
+            return jsonify({'error': 'No ticket keys provided'}), 400
+        if len(ticket_keys) > MAX_TICKET_KEYS:
+            return jsonify({'error': f'Too many tickets (max {MAX_TICKET_KEYS})'}), 400
+
+        def generate():
+            """Send each ticket as soon as it is read from the cache or fetched"""
+            found = set()
+            for key, ticket_details, cache_hit in iter_ticket_details(ticket_keys):
+                found.add(key)
+                filtered_data = filter_ticket_data_by_date(ticket_details, days)
+                filtered_data['_cache_hit'] = cache_hit
+                yield sse_event('ticket', filtered_data)
+
+            error = 'Issue not found' if jira_client else 'JIRA client not configured'
+            for key in ticket_keys:
+                if key not in found:
+                    yield sse_event('ticket-error', {'key': key, 'error': error})
+            yield sse_event('done', {})
+
+        return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+    except Exception as e:
+        print(f"Error streaming ticket details: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/workstream/export', methods=['POST'])
 def export_workstream_markdown():
     """Export workstream tickets and changelogs as markdown"""
@@ -777,103 +1268,87 @@ def export_workstream_markdown():
 
     try:
         data = request.json
-        ticket_keys = data.get('tickets', [])
+        ticket_keys = clean_ticket_keys(data.get('tickets', []))
         days = data.get('days', 7)
         workstream_name = data.get('name', 'Workstream')
         queries = data.get('queries', [])
 
         if not ticket_keys:
             return jsonify({'error': 'No tickets provided'}), 400
-
-        from datetime import datetime, timedelta, timezone
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+        if len(ticket_keys) > MAX_TICKET_KEYS:
+            return jsonify({'error': f'Too many tickets (max {MAX_TICKET_KEYS})'}), 400
 
         # Build markdown content
-        markdown = f"# {workstream_name}\n\n"
-        markdown += f"**Export Date:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
-        markdown += f"**Time Range:** Last {days} days\n"
-        markdown += f"**Ticket Count:** {len(ticket_keys)}\n\n"
+        parts = [f"# {workstream_name}\n\n"]
+        parts.append(f"**Export Date:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
+        parts.append(f"**Time Range:** Last {days} days\n")
+        parts.append(f"**Ticket Count:** {len(ticket_keys)}\n\n")
 
         # Add queries if provided
         if queries:
-            markdown += "## Queries\n\n"
+            parts.append("## Queries\n\n")
             for i, query in enumerate(queries, 1):
                 query_name = query.get('name', f'Query {i}')
                 query_jql = query.get('jql', '')
-                markdown += f"{i}. **{query_name}**\n   ```jql\n   {query_jql}\n   ```\n\n"
+                parts.append(f"{i}. **{query_name}**\n   ```jql\n   {query_jql}\n   ```\n\n")
 
-        markdown += "## Tickets\n\n"
+        parts.append("## Tickets\n\n")
 
-        # Fetch full details for each ticket
-        for key in ticket_keys:
-            try:
-                if not jira_client:
-                    raise Exception('JIRA client not configured')
-
-                # Use library to fetch issue with changelog
-                issue = jira_client.issue(key, expand='changelog')
-                fields = issue.fields
-
-                # Ticket header
-                summary = getattr(fields, 'summary', 'No summary')
-                status = getattr(fields, 'status', None)
-                assignee = getattr(fields, 'assignee', None)
-                priority = getattr(fields, 'priority', None)
-
-                markdown += f"### {key}: {summary}\n\n"
-                markdown += f"- **Status:** {status.name if status and hasattr(status, 'name') else 'Unknown'}\n"
-                markdown += f"- **Assignee:** {assignee.displayName if assignee and hasattr(assignee, 'displayName') else 'Unassigned'}\n"
-                markdown += f"- **Priority:** {priority.name if priority and hasattr(priority, 'name') else 'None'}\n"
-
-                # Add estimation if available
-                estimation_field_id = get_estimation_field_id()
-                if estimation_field_id:
-                    estimation_value = getattr(fields, estimation_field_id, None)
-                    if estimation_value:
-                        markdown += f"- **Estimation:** {estimation_value}\n"
-
-                markdown += f"- **URL:** {jira_config['host']}/browse/{key}\n\n"
-
-                # Description
-                description = getattr(fields, 'description', '')
-                if description:
-                    markdown += f"**Description:**\n{description[:500]}{'...' if len(description) > 500 else ''}\n\n"
-
-                # Changelog
-                recent_changes = []
-                if hasattr(issue, 'changelog') and issue.changelog:
-                    histories = issue.changelog.histories if hasattr(issue.changelog, 'histories') else []
-                    for history in histories:
-                        created_str_raw = history.created if hasattr(history, 'created') else None
-                        if not created_str_raw:
-                            continue
-                        created = datetime.fromisoformat(str(created_str_raw).replace('Z', '+00:00'))
-                        if created >= cutoff_date:
-                            author_obj = history.author if hasattr(history, 'author') else None
-                            author = author_obj.displayName if author_obj and hasattr(author_obj, 'displayName') else 'Unknown'
-                            created_str = created.strftime('%Y-%m-%d %H:%M')
-
-                            items = history.items if hasattr(history, 'items') else []
-                            for item in items:
-                                field = item.field if hasattr(item, 'field') else ''
-                                from_val = item.fromString if hasattr(item, 'fromString') else 'None'
-                                to_val = item.toString if hasattr(item, 'toString') else 'None'
-                                recent_changes.append(f"- `{created_str}` **{author}**: {field} changed from `{from_val}` to `{to_val}`")
-
-                if recent_changes:
-                    markdown += f"**Recent Changes (Last {days} days):**\n"
-                    markdown += "\n".join(recent_changes) + "\n\n"
-                else:
-                    markdown += f"*No changes in the last {days} days*\n\n"
+        header = ''.join(parts)
+        changes_heading = f"**Recent Changes (Last {days} days):**\n"
+        no_changes = f"*No changes in the last {days} days*\n\n"
 
-                markdown += "---\n\n"
+        def generate():
+            """Stream the header, then each ticket's section in the original order"""
+            yield header
 
-            except Exception as e:
-                print(f"Error fetching {key}: {e}")
-                markdown += f"### {key}\n*Error fetching details*\n\n---\n\n"
-                continue
+            # Reuse cached ticket details, bulk-fetching stale/missing tickets
+            details = bulk_get_ticket_details(ticket_keys)
+
+            for key in ticket_keys:
+                parts = []
+                try:
+                    ticket = details.get(key)
+                    if ticket is None:
+                        raise Exception('Issue not found' if jira_client else 'JIRA client not configured')
+
+                    # Ticket header
+                    parts.append(f"### {key}: {ticket['summary']}\n\n")
+                    parts.append(f"- **Status:** {ticket['status']}\n")
+                    parts.append(f"- **Assignee:** {ticket['assignee']}\n")
+                    parts.append(f"- **Priority:** {ticket['priority']}\n")
+
+                    # Add estimation if available
+                    if ticket.get('estimation'):
+                        parts.append(f"- **Estimation:** {ticket['estimation']}\n")
+
+                    parts.append(f"- **URL:** {jira_config['host']}/browse/{key}\n\n")
+
+                    # Description
+                    description = ticket.get('description') or ''
+                    if description:
+                        parts.append(f"**Description:**\n{description[:500]}{'...' if len(description) > 500 else ''}\n\n")
+
+                    # Changelog
+                    recent_changes = [
+                        f"- `{change['date']}` **{change['author']}**: {change['field']} changed from `{change['from']}` to `{change['to']}`"
+                        for change in filter_ticket_data_by_date(ticket, days)['changes']
+                    ]
+
+                    if recent_changes:
+                        parts.append(changes_heading)
+                        parts.append("\n".join(recent_changes) + "\n\n")
+                    else:
+                        parts.append(no_changes)
+
+                    parts.append("---\n\n")
+
+                except Exception as e:
+                    print(f"Error fetching {key}: {e}")
+                    parts.append(f"### {key}\n*Error fetching details*\n\n---\n\n")
+                yield ''.join(parts)
 
-        return jsonify({'markdown': markdown})
+        return Response(stream_with_context(generate()), mimetype='text/markdown')
 
     except Exception as e:
         print(f"Error generating markdown: {e}")
@@ -891,94 +1366,168 @@ def generate_workstream_summary():
 
     try:
         data = request.json
-        ticket_keys = data.get('tickets', [])
+        ticket_keys = clean_ticket_keys(data.get('tickets', []))
         days = data.get('days', 7)
         additional_context = data.get('context', '')
         omit_inactive = data.get('omit_inactive', False)
 
         if not ticket_keys:
             return jsonify({'error': 'No tickets provided'}), 400
+        if len(ticket_keys) > MAX_TICKET_KEYS:
+            return jsonify({'error': f'Too many tickets (max {MAX_TICKET_KEYS})'}), 400
 
-        # Fetch changelog for all tickets (using cache)
-        changelog_entries = []
+        if data.get('background'):
+            # Run the whole summary off the request; poll GET /api/workstream/summary/<job_id>
+            job_id = start_summary_job(ticket_keys, days, additional_context, omit_inactive)
+            return jsonify({'job_id': job_id, 'status': 'running'}), 202
 
-        for key in ticket_keys:
-            try:
-                # Use cached ticket details
-                ticket_details = get_cached_ticket_details(key, days)
-
-                # Skip tickets with no activity if requested
-                has_activity = (
-                    len(ticket_details.get('changes', [])) > 0 or
-                    len(ticket_details.get('comments', [])) > 0
-                )
-
-                if omit_inactive and not has_activity:
-                    continue
-
-                # Extract changelog entries
-                for change in ticket_details.get('changes', []):
-                    changelog_entries.append({
-                        'ticket': key,
-                        'date': change['date'],
-                        'author': change['author'],
-                        'field': change['field'],
-                        'from': change['from'],
-                        'to': change['to']
-                    })
-
-                # Extract comment entries
-                for comment in ticket_details.get('comments', []):
-                    changelog_entries.append({
-                        'ticket': key,
-                        'date': comment['date'],
-                        'author': comment['author'],
-                        'field': 'comment',
-                        'from': '',
-                        'to': comment['body'][:100] + ('...' if len(comment['body']) > 100 else '')
-                    })
-            except Exception as e:
-                print(f"Error fetching changelog for {key}: {e}")
-                continue
+        ticket_lines, lines = collect_summary_lines(ticket_keys, days, omit_inactive)
 
-        if not changelog_entries:
-            return jsonify({
-                'summary': f"No changes found in the last {days} days.",
-                'changeCount': 0
-            })
-
-        # Format changelog for LLM
-        changelog_text = "\n".join([
-            f"[{entry['date']}] {entry['ticket']} - {entry['author']}: {entry['field']} changed from '{entry['from']}' to '{entry['to']}'"
-            for entry in changelog_entries
-        ])
+        if lines and data.get('stream'):
+            def generate():
+                """Stream the summary as server-sent events while the LLM writes it"""
+                yield sse_event('meta', {'changeCount': len(lines), 'ticketCount': len(ticket_keys), 'days': days})
+                try:
+                    changelog_text, template = prepare_llm_input(ticket_lines, lines, days, additional_context)
+                    parts = []
+                    for delta in stream_llm(changelog_text, days, len(ticket_keys), len(lines), additional_context, template):
+                        parts.append(delta)
+                        yield sse_event('delta', {'text': delta})
+                    yield sse_event('done', {'summary': ''.join(parts).strip()})
+                except Exception as e:
+                    print(f"Error streaming summary: {e}")
+                    yield sse_event('error', {'error': str(e)})
 
-        # Call LLM to generate summary
-        summary = call_llm(changelog_text, days, len(ticket_keys), len(changelog_entries), additional_context)
+            return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
-        return jsonify({
-            'summary': summary,
-            'changeCount': len(changelog_entries),
-            'ticketCount': len(ticket_keys),
-            'days': days
-        })
+        return jsonify(summarize_lines(ticket_keys, days, additional_context, ticket_lines, lines))
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-def call_llm(changelog_text, days, ticket_count, change_count, additional_context=''):
-    """Call OpenAI-compatible LLM API to generate summary"""
+@app.route('/api/workstream/summary/<job_id>', methods=['GET'])
+def get_summary_job(job_id):
+    """Get the status (and result once finished) of a background summary job"""
+    job = load_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+def collect_summary_lines(ticket_keys, days, omit_inactive=False):
+    """Format ticket changes and comments in the time range as LLM input lines, also grouped per ticket"""
+    # Fetch changelog for all tickets (using cache), cache misses with parallel
+    # bulk searches, formatting each entry straight into the LLM input lines
+    lines = []
+    ticket_lines = []
+    details = bulk_get_ticket_details(ticket_keys)
+
+    for key in ticket_keys:
+        try:
+            if key not in details:
+                raise Exception('Issue not found')
+            ticket_details = filter_ticket_data_by_date(details[key], days)
+            changes = ticket_details.get('changes', [])
+            comments = ticket_details.get('comments', [])
+
+            # Skip tickets with no activity if requested
+            if omit_inactive and not changes and not comments:
+                continue
+
+            # Extract changelog entries as LLM_CHANGELOG_HEADER rows
+            entries = []
+            for change in condense_changes(changes):
+                entries.append(tsv_row(change['date'], key, change['author'], change['field'], change['from'], change['to']))
+
+            # Extract comment entries
+            for comment in comments:
+                body = comment['body'][:100] + ('...' if len(comment['body']) > 100 else '')
+                entries.append(tsv_row(comment['date'], key, comment['author'], 'comment', '', body))
+
+            if entries:
+                ticket_lines.append(entries)
+                lines.extend(entries)
+        except Exception as e:
+            print(f"Error fetching changelog for {key}: {e}")
+            continue
+
+    return ticket_lines, lines
+
+def tsv_row(*values):
+    """Join values into one tab-separated line, flattening tabs and newlines inside them"""
+    return '\t'.join(' '.join(str(value or '').split()) for value in values)
+
+def summarize_lines(ticket_keys, days, additional_context, ticket_lines, lines):
+    """Summarize collected changelog lines with the LLM into the summary response"""
+    if not lines:
+        return {
+            'summary': f"No changes found in the last {days} days.",
+            'changeCount': 0
+        }
+
+    # Call LLM to generate summary
+    changelog_text, template = prepare_llm_input(ticket_lines, lines, days, additional_context)
+    summary = call_llm(changelog_text, days, len(ticket_keys), len(lines), additional_context, template)
+
+    return {
+        'summary': summary,
+        'changeCount': len(lines),
+        'ticketCount': len(ticket_keys),
+        'days': days
+    }
+
+def start_summary_job(ticket_keys, days, additional_context='', omit_inactive=False):
+    """Queue a workstream summary on the background pool and return its job ID"""
+    job_id = uuid.uuid4().hex
+    save_job(job_id, {'status': 'running'})
+    summary_executor.submit(run_summary_job, job_id, ticket_keys, days, additional_context, omit_inactive)
+    return job_id
+
+def run_summary_job(job_id, ticket_keys, days, additional_context, omit_inactive):
+    """Generate a summary and record the result (or error) in the job file"""
     try:
-        from openai import OpenAI
+        ticket_lines, lines = collect_summary_lines(ticket_keys, days, omit_inactive)
+        result = summarize_lines(ticket_keys, days, additional_context, ticket_lines, lines)
+        save_job(job_id, {'status': 'finished', 'result': result})
+    except Exception as e:
+        print(f"Error in summary job {job_id}: {e}")
+        save_job(job_id, {'status': 'failed', 'error': str(e)})
 
-        client = OpenAI(
-            api_key=llm_config['api_key'],
-            base_url=llm_config['api_base']
-        )
+# Job files are shared by all worker processes, so any of them can answer a poll
+def save_job(job_id, job):
+    """Save a summary job's state to jobs/<job_id>.json"""
+    try:
+        os.makedirs(JOBS_DIR, exist_ok=True)
+        write_json_atomic(os.path.join(JOBS_DIR, f'{job_id}.json'), job)
+    except Exception as e:
+        print(f"Error saving summary job {job_id}: {e}")
 
-        prompt = f"""Analyze these JIRA ticket changes from the last {days} days ({change_count} changes across {ticket_count} tickets) and provide a concise, actionable summary.
+def load_job(job_id):
+    """Load a summary job's state, or None if unknown"""
+    if not JOB_ID_RE.fullmatch(job_id):
+        return None
+    try:
+        with open(os.path.join(JOBS_DIR, f'{job_id}.json'), 'rb') as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
 
-Changes:
+LLM_TIMEOUT_SECONDS = 60
+# Changelog fields that carry no signal for a summary (matched lowercased)
+LLM_IGNORED_FIELDS = frozenset({
+    'rank', 'link', 'remoteissuelink', 'worklogid',
+    'timespent', 'timeestimate', 'timeoriginalestimate',
+    'aggregatetimespent', 'aggregatetimeestimate', 'aggregatetimeoriginalestimate'
+})
+# Edits of one field by the same author this close together count as one change
+LLM_MERGE_WINDOW_SECONDS = 10 * 60
+LLM_CACHE_TTL_SECONDS = 600
+# Changelog rows are tab-separated rather than sentences, which takes far fewer tokens
+LLM_CHANGELOG_HEADER = 'date\tticket\tauthor\tfield\tfrom\tto'
+
+LLM_PROMPT_TEMPLATE = """Analyze these JIRA ticket changes from the last {days} days ({change_count} changes across {ticket_count} tickets) and provide a concise, actionable summary.
+
+Changes (tab-separated, one per line; comments have field "comment" and the comment text in "to"):
 {changelog_text}
 
 Please provide a brief summary focusing on:
@@ -990,23 +1539,181 @@ Please provide a brief summary focusing on:
 
 Keep it concise (3-5 bullet points) and actionable for a team standup."""
 
-        if additional_context:
-            prompt += f"\n\nAdditional context/instructions: {additional_context}"
+# Combines the partial summaries of a changelog too large for one request
+LLM_REDUCE_PROMPT_TEMPLATE = """Below are partial summaries of JIRA ticket changes from the last {days} days ({change_count} changes across {ticket_count} tickets). Each part covers a different subset of the tickets.
 
-        response = client.chat.completions.create(
-            model=llm_config['model'],
-            messages=[
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=1024,
-            temperature=0.7
-        )
+Partial summaries:
+{changelog_text}
+
+Combine them into a single summary focusing on:
+1. Major progress and completions
+2. Active work areas
+3. Any blockers or concerning patterns
+4. Notable status changes
+5. Key trends
+
+Keep it concise (3-5 bullet points) and actionable for a team standup."""
+
+# OpenAI client shared across calls so its connection pool is reused
+llm_client = None
+llm_client_lock = threading.Lock()
+
+def get_llm_client():
+    """Create the OpenAI-compatible client on first use"""
+    global llm_client
+    with llm_client_lock:
+        if llm_client is None:
+            from openai import OpenAI
+
+            llm_client = OpenAI(
+                api_key=llm_config['api_key'],
+                base_url=llm_config['api_base'],
+                timeout=LLM_TIMEOUT_SECONDS
+            )
+        return llm_client
+
+# Summaries keyed by a hash of model + prompt, so repeated requests over an
+# unchanged changelog skip the LLM round-trip
+llm_cache = TTLCache(maxsize=256, ttl=LLM_CACHE_TTL_SECONDS)
+llm_cache_lock = threading.Lock()
+
+def condense_changes(changes):
+    """Drop noise fields and merge quick successive edits of a field by one author"""
+    condensed = []
+    last_edit = {}
+    for change in changes:
+        if change['field'].lower() in LLM_IGNORED_FIELDS:
+            continue
+        timestamp = datetime.fromisoformat(change['date_iso']).timestamp()
+        edit_key = (change['field'], change['author'])
+        previous = last_edit.get(edit_key)
+        if previous and timestamp - previous[1] <= LLM_MERGE_WINDOW_SECONDS:
+            # Keep the first edit's date and old value, take the latest new value
+            previous[0]['to'] = change['to']
+            last_edit[edit_key] = (previous[0], timestamp)
+            continue
+        # Copy, as changes belong to the shared ticket cache
+        change = dict(change)
+        condensed.append(change)
+        last_edit[edit_key] = (change, timestamp)
+    # Edits merged back to where they started (A -> B -> A) are no change at all
+    return [change for change in condensed if change['from'] != change['to']]
+
+def build_llm_prompt(changelog_text, days, ticket_count, change_count, additional_context='', template=LLM_PROMPT_TEMPLATE):
+    """Build the summary prompt and its LLM cache key"""
+    prompt = template.format(
+        days=days,
+        change_count=change_count,
+        ticket_count=ticket_count,
+        changelog_text=changelog_text
+    )
+
+    if additional_context:
+        prompt += f"\n\nAdditional context/instructions: {additional_context}"
+
+    cache_key = hashlib.sha1(f"{llm_config['model']}\n{prompt}".encode()).hexdigest()
+    return prompt, cache_key
+
+def create_llm_completion(prompt, stream=False):
+    """Send the summary prompt to the OpenAI-compatible chat completions API"""
+    return get_llm_client().chat.completions.create(
+        model=llm_config['model'],
+        messages=[
+            {"role": "user", "content": prompt}
+        ],
+        max_tokens=1024,
+        temperature=0.7,
+        stream=stream
+    )
+
+def call_llm(changelog_text, days, ticket_count, change_count, additional_context='', template=LLM_PROMPT_TEMPLATE):
+    """Call OpenAI-compatible LLM API to generate summary"""
+    try:
+        prompt, cache_key = build_llm_prompt(changelog_text, days, ticket_count, change_count, additional_context, template)
+        with llm_cache_lock:
+            cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        response = create_llm_completion(prompt)
 
-        return response.choices[0].message.content.strip()
+        summary = response.choices[0].message.content.strip()
+        with llm_cache_lock:
+            llm_cache[cache_key] = summary
+        return summary
 
     except Exception as e:
         raise Exception(f"LLM API error: {str(e)}")
 
+def stream_llm(changelog_text, days, ticket_count, change_count, additional_context='', template=LLM_PROMPT_TEMPLATE):
+    """Yield the LLM summary in chunks as it is generated (cached summaries in one chunk)"""
+    prompt, cache_key = build_llm_prompt(changelog_text, days, ticket_count, change_count, additional_context, template)
+    with llm_cache_lock:
+        cached = llm_cache.get(cache_key)
+    if cached is not None:
+        yield cached
+        return
+
+    parts = []
+    try:
+        for chunk in create_llm_completion(prompt, stream=True):
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                yield delta
+    except Exception as e:
+        raise Exception(f"LLM API error: {str(e)}")
+
+    with llm_cache_lock:
+        llm_cache[cache_key] = ''.join(parts).strip()
+
+def prepare_llm_input(ticket_lines, lines, days, additional_context=''):
+    """Return the changelog text and prompt template for the final LLM call"""
+    # Changelogs over the input budget (roughly 4 characters per token) are
+    # summarized in chunks of whole tickets in parallel, then combined
+    max_chars = llm_config['max_input_tokens'] * 4
+    changelog_text = "\n".join([LLM_CHANGELOG_HEADER, *lines])
+    if len(changelog_text) <= max_chars:
+        return changelog_text, LLM_PROMPT_TEMPLATE
+
+    chunks = chunk_ticket_lines(ticket_lines, max_chars - len(LLM_CHANGELOG_HEADER) - 1)
+    print(f"Changelog too large for one LLM request, summarizing {len(chunks)} chunks")
+    futures = [
+        llm_executor.submit(call_llm, "\n".join([LLM_CHANGELOG_HEADER, *chunk_lines]), days, chunk_ticket_count, len(chunk_lines), additional_context)
+        for chunk_lines, chunk_ticket_count in chunks
+    ]
+    partials = [future.result() for future in futures]
+    return "\n\n".join(f"Part {i}:\n{partial}" for i, partial in enumerate(partials, 1)), LLM_REDUCE_PROMPT_TEMPLATE
+
+def chunk_ticket_lines(ticket_lines, max_chars):
+    """Pack per-ticket changelog lines into (lines, ticket count) chunks of at most max_chars"""
+    chunks = []
+    current = []
+    current_tickets = 0
+    size = 0
+    for entries in ticket_lines:
+        # Start a new chunk rather than split a ticket that would fit in one
+        entries_size = sum(len(line) + 1 for line in entries)
+        if current and size + entries_size > max_chars:
+            chunks.append((current, current_tickets))
+            current, current_tickets, size = [], 0, 0
+
+        current_tickets += 1
+        for line in entries:
+            if current and size + len(line) + 1 > max_chars:
+                chunks.append((current, current_tickets))
+                current, current_tickets, size = [], 1, 0
+            current.append(line)
+            size += len(line) + 1
+
+    if current:
+        chunks.append((current, current_tickets))
+    return chunks
+
+def sse_event(event, payload):
+    """Format a server-sent event with a JSON payload"""
+    return f"event: {event}\ndata: {orjson.dumps(payload).decode()}\n\n"
+
 if __name__ == '__main__':
     print('=' * 60)
     print('pioj')
@@ -1027,4 +1734,6 @@ if __name__ == '__main__':
     print('Open http://localhost:5000 in your browser')
     print('Press Ctrl+C to stop')
     print('=' * 60)
-    app.run(debug=True, port=5000)
+    # Development server; set FLASK_DEBUG=1 for the reloader and debugger,
+    # and see wsgi.py for running under gunicorn
+    app.run(port=5000)
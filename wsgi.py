@@ -0,0 +1,7 @@
+"""Production entrypoint: gunicorn -k gevent -w 2 --worker-connections 200 -b 127.0.0.1:5000 wsgi:app"""
+from gevent import monkey
+
+# Patch blocking I/O before server (and requests/openai) are imported
+monkey.patch_all()
+
+from server import app  # noqa: E402